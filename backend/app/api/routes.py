@@ -1,7 +1,8 @@
+import asyncio
 import logging
-from datetime import datetime
-from typing import Optional
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form
+from datetime import datetime, timezone
+from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, HTTPException, Depends, Form, Response
 from fastapi.responses import JSONResponse
 
 from app.models.schemas import (
@@ -16,7 +17,7 @@ from app.models.schemas import (
     ScoreBreakdown
 )
 from app.services.file_service import file_service
-from app.services.gemini_service import gemini_service
+from app.services.gemini_service import get_gemini_service, InvalidGeminiKeyError
 from app.services.scraping_service import scraping_service
 
 logger = logging.getLogger(__name__)
@@ -24,6 +25,14 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+async def _cleanup_file_async(file_id: str) -> bool:
+    """Run the blocking file cleanup in the threadpool so disk I/O never
+    stalls the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(
+        None, file_service.cleanup_file, file_id
+    )
+
+
 @router.options("/comprehensive-analysis")
 async def comprehensive_analysis_options():
     """Handle CORS preflight for comprehensive analysis endpoint"""
@@ -32,6 +41,7 @@ async def comprehensive_analysis_options():
 
 @router.post("/comprehensive-analysis")
 async def comprehensive_analysis(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     job_description: str = Form(...)
 ):
@@ -41,9 +51,10 @@ async def comprehensive_analysis(
     - AI analyzes candidate against specific job requirements
     - Performs complete analysis with scoring based on job description
     """
+    file_id: Optional[str] = None
     try:
         logger.info(f"Starting comprehensive analysis for file: {file.filename}, job_description length: {len(job_description)}")
-        
+
         # Validate required job description
         if not job_description.strip():
             raise HTTPException(
@@ -57,64 +68,75 @@ async def comprehensive_analysis(
                 detail="Job description must be at least 50 characters long for meaningful analysis"
             )
         
-        # Step 1: Save and extract text from resume
+        # Kick off the job-description parse immediately - it only needs the
+        # form text, so it overlaps with resume save and text extraction
+        jd_task = asyncio.create_task(
+            get_gemini_service().parse_job_description_text(job_description.strip())
+        )
+
+        # Step 1: Save and extract text from resume (overlapped with JD parse)
         success, message, file_id = await file_service.save_file(file)
         if not success:
+            jd_task.cancel()
             raise HTTPException(status_code=400, detail=message)
 
         success, message, resume_text = await file_service.extract_text_from_file(file_id)
         if not success:
-            file_service.cleanup_file(file_id)
+            jd_task.cancel()
+            await _cleanup_file_async(file_id)
             raise HTTPException(status_code=400, detail=message)
 
-        # Step 2: Parse resume and extract social media URLs
-        logger.info("Parsing resume and extracting URLs...")
-        try:
-            resume_result = await gemini_service.parse_resume_with_urls(resume_text)
-            resume_data = resume_result["resume_data"]
-            social_urls = resume_result["social_urls"]
-        except Exception as e:
-            if "API_KEY_INVALID" in str(e) or "API key not valid" in str(e):
+        # Steps 2 & 3: Parse resume concurrently with the in-flight JD parse -
+        # the two Gemini calls are independent, so wall time is ~max of the two
+        # instead of their sum
+        logger.info("Parsing resume and job description with AI (concurrently)...")
+        resume_result, job_description_parsed = await asyncio.gather(
+            get_gemini_service().parse_resume_with_urls(resume_text),
+            jd_task,
+            return_exceptions=True
+        )
+
+        if isinstance(resume_result, Exception):
+            e = resume_result
+            await _cleanup_file_async(file_id)
+            if isinstance(e, InvalidGeminiKeyError):
                 raise HTTPException(
-                    status_code=400, 
+                    status_code=400,
                     detail="Invalid Gemini API key. Please check your API key configuration."
                 )
             raise HTTPException(status_code=500, detail=f"Failed to parse resume: {str(e)}")
-        
-        # Step 3: Parse job description text using AI
-        logger.info("Parsing job description text with AI...")
-        try:
-            job_description_parsed = await gemini_service.parse_job_description_text(job_description.strip())
-        except Exception as e:
+
+        if isinstance(job_description_parsed, Exception):
+            e = job_description_parsed
             logger.error(f"Failed to parse job description: {str(e)}")
-            file_service.cleanup_file(file_id)
+            await _cleanup_file_async(file_id)
             raise HTTPException(
-                status_code=400, 
+                status_code=400,
                 detail=f"Failed to parse job description: {str(e)}. Please provide a more detailed job description."
             )
 
+        resume_data = resume_result["resume_data"]
+        social_urls = resume_result["social_urls"]
+
         # Step 4: Perform comprehensive analysis based on job description
         logger.info("Performing comprehensive AI analysis...")
         try:
-            analysis_result = await gemini_service.comprehensive_candidate_analysis(
+            analysis_result = await get_gemini_service().comprehensive_candidate_analysis(
                 resume_data=resume_data,
                 job_description=job_description_parsed,
                 profile_enrichment=None
             )
+        except InvalidGeminiKeyError:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid Gemini API key. Please check your API key configuration in backend/.env file."
+            )
         except Exception as e:
-            if "API_KEY_INVALID" in str(e) or "API key not valid" in str(e):
-                raise HTTPException(
-                    status_code=400, 
-                    detail="Invalid Gemini API key. Please check your API key configuration in backend/.env file."
-                )
             raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
         # Step 5: Structure the response
         score_breakdown = ScoreBreakdown(
             resume_match=analysis_result["score_breakdown"].get("required_skills_match", 0),
-            linkedin_score=0.0,  # Removed profile enrichment
-            github_score=0.0,    # Removed profile enrichment
-            portfolio_score=0.0, # Removed profile enrichment
             total_score=analysis_result["overall_score"],
             explanation=analysis_result.get("detailed_job_fit_analysis", "Analysis completed")
         )
@@ -127,11 +149,12 @@ async def comprehensive_analysis(
             score_breakdown=score_breakdown,
             recommendations=analysis_result.get("interview_focus_areas", []),
             red_flags=analysis_result.get("red_flags_for_this_role", []),
-            analysis_timestamp=datetime.now()
+            analysis_timestamp=datetime.now(timezone.utc)
         )
 
-        # Clean up uploaded file
-        file_service.cleanup_file(file_id)
+        # Clean up the uploaded file after the response is sent - the client
+        # shouldn't wait on the unlink for a result it already has
+        background_tasks.add_task(file_service.cleanup_file, file_id)
 
         return {
             "success": True,
@@ -157,11 +180,124 @@ async def comprehensive_analysis(
     except Exception as e:
         logger.error(f"Error in comprehensive analysis: {str(e)}")
         # Clean up file if it exists
-        if 'file_id' in locals():
-            file_service.cleanup_file(file_id)
+        if file_id is not None:
+            await _cleanup_file_async(file_id)
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+@router.post("/bulk-analyze")
+async def bulk_analyze(
+    files: List[UploadFile] = File(...),
+    job_description: str = Form(...)
+):
+    """
+    Analyze multiple resumes against one job description concurrently
+    - Job description is parsed once and shared across all candidates
+    - Per-resume pipelines run concurrently, bounded by a semaphore
+    - Returns one success/error entry per uploaded file
+    """
+    try:
+        if not job_description.strip():
+            raise HTTPException(
+                status_code=400,
+                detail="Job description is required for accurate candidate analysis"
+            )
+
+        if len(job_description.strip()) < 50:
+            raise HTTPException(
+                status_code=400,
+                detail="Job description must be at least 50 characters long for meaningful analysis"
+            )
+
+        if not files:
+            raise HTTPException(status_code=400, detail="At least one resume file is required")
+
+        logger.info(f"Starting bulk analysis for {len(files)} files")
+
+        # Parse the shared job description once - a single Gemini call reused
+        # for every candidate
+        try:
+            job_description_parsed = await get_gemini_service().parse_job_description_text(job_description.strip())
+        except Exception as e:
+            logger.error(f"Failed to parse job description: {str(e)}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"Failed to parse job description: {str(e)}. Please provide a more detailed job description."
+            )
+
+        # Bound concurrency so a large batch doesn't thrash Gemini rate limits
+        semaphore = asyncio.Semaphore(8)
+
+        async def _analyze_one(file: UploadFile):
+            async with semaphore:
+                file_id = None
+                try:
+                    success, message, file_id = await file_service.save_file(file)
+                    if not success:
+                        raise HTTPException(status_code=400, detail=message)
+
+                    success, message, resume_text = await file_service.extract_text_from_file(file_id)
+                    if not success:
+                        raise HTTPException(status_code=400, detail=message)
+
+                    resume_result = await get_gemini_service().parse_resume_with_urls(resume_text)
+                    resume_data = resume_result["resume_data"]
+
+                    analysis_result = await get_gemini_service().comprehensive_candidate_analysis(
+                        resume_data=resume_data,
+                        job_description=job_description_parsed,
+                        profile_enrichment=None
+                    )
+
+                    return {
+                        "filename": file.filename,
+                        "success": True,
+                        "candidate_name": resume_data.name or "Unknown Candidate",
+                        "overall_score": analysis_result["overall_score"],
+                        "score_breakdown": analysis_result.get("score_breakdown", {}),
+                        "skills_analysis": analysis_result.get("skills_analysis", {}),
+                        "hiring_recommendation": analysis_result.get("hiring_recommendation", {}),
+                        "detailed_job_fit_analysis": analysis_result.get("detailed_job_fit_analysis", "")
+                    }
+                finally:
+                    if file_id:
+                        await _cleanup_file_async(file_id)
+
+        # Submit every pipeline first, then collect - awaiting inside the loop
+        # would serialize the batch
+        results = await asyncio.gather(
+            *[_analyze_one(file) for file in files],
+            return_exceptions=True
+        )
+
+        analyses = []
+        for file, result in zip(files, results):
+            if isinstance(result, Exception):
+                detail = result.detail if isinstance(result, HTTPException) else str(result)
+                logger.error(f"Bulk analysis failed for {file.filename}: {detail}")
+                analyses.append({
+                    "filename": file.filename,
+                    "success": False,
+                    "error": detail
+                })
+            else:
+                analyses.append(result)
+
+        succeeded = sum(1 for a in analyses if a["success"])
+        return {
+            "success": True,
+            "message": f"Analyzed {succeeded} of {len(files)} resumes for {job_description_parsed.title} position",
+            "job_description": job_description_parsed,
+            "results": analyses
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in bulk analysis: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Bulk analysis failed: {str(e)}")
+
+
 @router.post("/upload-resume", response_model=UploadResumeResponse)
 async def upload_resume(file: UploadFile = File(...)):
     """Upload and parse a resume file (legacy endpoint)"""
@@ -174,11 +310,11 @@ async def upload_resume(file: UploadFile = File(...)):
         # Extract text from the file
         success, message, resume_text = await file_service.extract_text_from_file(file_id)
         if not success:
-            file_service.cleanup_file(file_id)
+            await _cleanup_file_async(file_id)
             raise HTTPException(status_code=400, detail=message)
 
         # Parse resume using Gemini AI
-        resume_result = await gemini_service.parse_resume_with_urls(resume_text)
+        resume_result = await get_gemini_service().parse_resume_with_urls(resume_text)
         resume_data = resume_result["resume_data"]
 
         return UploadResumeResponse(
@@ -195,15 +331,30 @@ async def upload_resume(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail="Internal server error during file upload")
 
 
+# In-flight extractions keyed by URL so a burst of identical requests shares
+# one scrape + Gemini call instead of fanning out duplicates
+_job_url_inflight: dict = {}
+
+
 @router.post("/extract-job-from-url")
-async def extract_job_from_url(job_url: str):
+async def extract_job_from_url(job_url: str, response: Response):
     """Extract job description from URL"""
     try:
         if not job_url.strip():
             raise HTTPException(status_code=400, detail="Job URL is required")
 
-        job_description = await gemini_service.extract_job_description_from_url(job_url)
-        
+        key = job_url.strip()
+        task = _job_url_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(get_gemini_service().extract_job_description_from_url(key))
+            _job_url_inflight[key] = task
+            task.add_done_callback(lambda _: _job_url_inflight.pop(key, None))
+
+        job_description = await asyncio.shield(task)
+
+        # Results are cached for an hour service-side; let proxies/CDNs
+        # short-circuit repeat lookups too
+        response.headers["Cache-Control"] = "public, max-age=3600"
         return {
             "success": True,
             "message": "Job description extracted successfully",
@@ -217,27 +368,23 @@ async def extract_job_from_url(job_url: str):
         raise HTTPException(status_code=500, detail=f"Failed to extract job description: {str(e)}")
 
 
-@router.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
-
-
 @router.post("/validate-job-description")
 async def validate_job_description(job_description: JobDescription):
     """Validate job description format and content"""
     try:
-        # Basic validation
-        if not job_description.title.strip():
+        # Fields are stripped at parse time by the JobDescription validator,
+        # so a single emptiness/length pass is enough here
+        if not job_description.title:
             raise HTTPException(status_code=400, detail="Job title is required")
-        
-        if not job_description.company.strip():
+
+        if not job_description.company:
             raise HTTPException(status_code=400, detail="Company name is required")
-        
-        if not job_description.description.strip():
+
+        description_length = len(job_description.description)
+        if description_length == 0:
             raise HTTPException(status_code=400, detail="Job description is required")
-        
-        if len(job_description.description) < 50:
+
+        if description_length < 50:
             raise HTTPException(status_code=400, detail="Job description is too short (minimum 50 characters)")
 
         return {
@@ -246,7 +393,7 @@ async def validate_job_description(job_description: JobDescription):
             "details": {
                 "title": job_description.title,
                 "company": job_description.company,
-                "description_length": len(job_description.description),
+                "description_length": description_length,
                 "required_skills_count": len(job_description.required_skills),
                 "preferred_skills_count": len(job_description.preferred_skills)
             }
@@ -263,7 +410,7 @@ async def validate_job_description(job_description: JobDescription):
 async def cleanup_file(file_id: str):
     """Clean up uploaded file"""
     try:
-        success = file_service.cleanup_file(file_id)
+        success = await _cleanup_file_async(file_id)
         if success:
             return {"success": True, "message": "File cleaned up successfully"}
         else:
@@ -280,7 +427,9 @@ async def cleanup_file(file_id: str):
 async def bulk_cleanup(max_age_hours: int = 24):
     """Clean up old uploaded files"""
     try:
-        deleted_count = file_service.cleanup_old_files(max_age_hours)
+        deleted_count = await asyncio.get_running_loop().run_in_executor(
+            None, file_service.cleanup_old_files, max_age_hours
+        )
         return {
             "success": True,
             "message": f"Cleaned up {deleted_count} old files",
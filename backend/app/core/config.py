@@ -1,6 +1,7 @@
 import os
-from typing import List
-from pydantic_settings import BaseSettings
+from functools import cached_property
+from typing import FrozenSet, Tuple
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -22,30 +23,36 @@ class Settings(BaseSettings):
     GEMINI_MODEL: str = "gemini-2.0-flash"
     GEMINI_TEMPERATURE: float = 0.1
     GEMINI_MAX_OUTPUT_TOKENS: int = 2048
+    GEMINI_MAX_CONCURRENCY: int = 8
     
     # Web Scraping Configuration
     SCRAPING_TIMEOUT: int = 30
     MAX_RETRIES: int = 3
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-        extra = "ignore"  # Allow extra fields in environment
-
-    @property
-    def cors_origins_list(self) -> List[str]:
-        return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
-    @property
-    def allowed_extensions_list(self) -> List[str]:
-        return [ext.strip().lower() for ext in self.ALLOWED_EXTENSIONS.split(",")]
+    # Optional GitHub token: raises the API quota from 60 to 5000 req/h
+    GITHUB_TOKEN: str = ""
+    
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        extra="ignore"  # Allow extra fields in environment
+    )
+
+    @cached_property
+    def cors_origins_list(self) -> Tuple[str, ...]:
+        """CORS origins parsed once from the CSV setting"""
+        return tuple(origin.strip() for origin in self.CORS_ORIGINS.split(","))
+
+    @cached_property
+    def allowed_extensions_list(self) -> FrozenSet[str]:
+        """Allowed extensions parsed once into a frozenset for O(1) lookups"""
+        return frozenset(ext.strip().lower() for ext in self.ALLOWED_EXTENSIONS.split(","))
 
     def is_file_allowed(self, filename: str) -> bool:
         """Check if file extension is allowed"""
         if not filename:
             return False
-        extension = filename.rsplit('.', 1)[-1].lower()
-        return extension in self.allowed_extensions_list
+        return filename.rpartition('.')[2].lower() in self.allowed_extensions_list
 
     def validate_gemini_api_key(self) -> bool:
         """Validate that GEMINI_API_KEY is provided and not empty"""
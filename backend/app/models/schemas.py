@@ -1,10 +1,14 @@
-from pydantic import BaseModel, EmailStr, HttpUrl
+from pydantic import BaseModel, ConfigDict, EmailStr, HttpUrl, field_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 
 class ExperienceItem(BaseModel):
     """Individual experience item"""
+    # Frozen models let pydantic's Rust core use a compact immutable layout;
+    # these are created by the dozen per parsed resume and never mutated
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     title: str
     company: str
     duration: str
@@ -13,6 +17,8 @@ class ExperienceItem(BaseModel):
 
 class EducationItem(BaseModel):
     """Individual education item"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     degree: str
     institution: str
     year: str
@@ -21,6 +27,8 @@ class EducationItem(BaseModel):
 
 class ProjectItem(BaseModel):
     """Individual project item"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     name: str
     description: str
     technologies: List[str] = []
@@ -28,6 +36,8 @@ class ProjectItem(BaseModel):
 
 class ResumeData(BaseModel):
     """Parsed resume data structure"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     name: Optional[str] = None
     email: Optional[str] = None
     phone: Optional[str] = None
@@ -46,6 +56,8 @@ class ResumeData(BaseModel):
 
 class JobDescription(BaseModel):
     """Job description structure"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     title: str
     company: str
     description: str
@@ -55,6 +67,15 @@ class JobDescription(BaseModel):
     education_requirements: List[str] = []
     location: Optional[str] = None
 
+    @field_validator('title', 'company', 'description', mode='before')
+    @classmethod
+    def _strip_text(cls, value):
+        """Strip surrounding whitespace once at parse time so downstream
+        consumers never re-strip"""
+        if isinstance(value, str):
+            return value.strip()
+        return value
+
 
 class LinkedInProfile(BaseModel):
     """LinkedIn profile data"""
@@ -92,9 +113,6 @@ class ProfileEnrichment(BaseModel):
 class ScoreBreakdown(BaseModel):
     """Scoring breakdown structure"""
     resume_match: float
-    linkedin_score: float = 0.0
-    github_score: float = 0.0
-    portfolio_score: float = 0.0
     total_score: float
     explanation: str
 
@@ -159,4 +177,28 @@ class ErrorResponse(BaseModel):
     success: bool = False
     message: str
     error_code: Optional[str] = None
-    details: Optional[Dict[str, Any]] = None 
\ No newline at end of file
+    details: Optional[Dict[str, Any]] = None
+
+
+# Force core-schema and validator construction at import time so a fresh
+# worker's first request doesn't pay the deferred build cost in-loop
+for _model in (
+    ExperienceItem,
+    EducationItem,
+    ProjectItem,
+    ResumeData,
+    JobDescription,
+    LinkedInProfile,
+    GitHubProfile,
+    ProfileEnrichment,
+    ScoreBreakdown,
+    CandidateAnalysis,
+    UploadResumeRequest,
+    UploadResumeResponse,
+    AnalyzeCandidateRequest,
+    AnalyzeCandidateResponse,
+    EnrichProfileRequest,
+    EnrichProfileResponse,
+    ErrorResponse,
+):
+    _model.model_rebuild() 
\ No newline at end of file
@@ -1,10 +1,13 @@
+import asyncio
 import os
+import re
+import time
 import uuid
 import logging
-from typing import Optional, Tuple
-import aiofiles
+from typing import Dict, Optional, Tuple
+import shutil
 from fastapi import UploadFile, HTTPException
-import PyPDF2
+import pypdfium2
 from docx import Document
 from io import BytesIO
 
@@ -13,6 +16,11 @@ from app.models.schemas import ResumeData
 
 logger = logging.getLogger(__name__)
 
+# Built once at import: endswith accepts a tuple directly, and the compiled
+# pattern covers '..' plus both slash styles in a single C-level scan
+_DANGEROUS_EXTENSIONS = ('.exe', '.bat', '.cmd', '.scr', '.com', '.pif')
+_BAD_PATH_RE = re.compile(r'\.\.|[/\\]')
+
 
 class FileService:
     def __init__(self):
@@ -20,6 +28,24 @@ class FileService:
         self.upload_dir = settings.UPLOAD_DIR
         os.makedirs(self.upload_dir, exist_ok=True)
 
+        # In-process file_id -> (path, ctime) index: lookups become one dict
+        # hit instead of a directory scan per call. Seeded from disk so files
+        # surviving a restart stay reachable
+        self._index: Dict[str, Tuple[str, float]] = {}
+        with os.scandir(self.upload_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and '.' in entry.name:
+                    existing_id = entry.name.split('.', 1)[0]
+                    self._index[existing_id] = (entry.path, entry.stat().st_ctime)
+
+        # Extension -> extractor dispatch: one dict lookup per call instead of
+        # an if/elif chain, and a single registration point for new formats
+        self._extractors = {
+            'pdf': self._extract_pdf_text,
+            'docx': self._extract_docx_text,
+            'txt': self._extract_txt_text,
+        }
+
     def validate_file(self, file: UploadFile) -> Tuple[bool, str]:
         """Validate uploaded file for security and format"""
         try:
@@ -38,12 +64,11 @@ class FileService:
             filename = file.filename.lower()
             
             # Check for dangerous file extensions
-            dangerous_extensions = ['.exe', '.bat', '.cmd', '.scr', '.com', '.pif']
-            if any(filename.endswith(ext) for ext in dangerous_extensions):
+            if filename.endswith(_DANGEROUS_EXTENSIONS):
                 return False, "Potentially dangerous file type detected"
 
             # Check for path traversal attempts
-            if '..' in filename or '/' in filename or '\\' in filename:
+            if _BAD_PATH_RE.search(filename):
                 return False, "Invalid filename characters detected"
 
             return True, "File validation passed"
@@ -66,10 +91,11 @@ class FileService:
             secure_filename = f"{file_id}.{file_extension}"
             file_path = os.path.join(self.upload_dir, secure_filename)
 
-            # Save file
-            async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                await f.write(content)
+            # Stream file to disk in 1 MiB chunks so peak memory stays
+            # O(chunk); one to_thread dispatch covers the whole copy instead of
+            # a thread hop per aiofiles syscall
+            await asyncio.to_thread(self._copy_stream_sync, file.file, file_path)
+            self._index[file_id] = (file_path, time.time())
 
             logger.info(f"File saved successfully: {file_id}")
             return True, "File saved successfully", file_id
@@ -78,17 +104,30 @@ class FileService:
             logger.error(f"Error saving file: {str(e)}")
             return False, f"Failed to save file: {str(e)}", ""
 
+    def _copy_stream_sync(self, source, file_path: str) -> None:
+        """Copy the spooled upload to its destination in fixed-size chunks"""
+        with open(file_path, 'wb') as destination:
+            if hasattr(os, 'posix_fadvise'):
+                # Tell the kernel the write pattern is sequential so pagecache
+                # writeback is tuned for streaming
+                os.posix_fadvise(destination.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            shutil.copyfileobj(source, destination, 1 << 20)
+
     def get_file_path(self, file_id: str) -> Optional[str]:
         """Get file path from file ID"""
-        try:
-            # Find file with matching ID (any extension)
-            for filename in os.listdir(self.upload_dir):
-                if filename.startswith(file_id + '.'):
-                    return os.path.join(self.upload_dir, filename)
-            return None
-        except Exception as e:
-            logger.error(f"Error getting file path: {str(e)}")
-            return None
+        entry = self._index.get(file_id)
+        if entry:
+            return entry[0]
+
+        # Index miss: the upload may have landed in another worker process
+        # (main.py runs one index per worker). Fall back to the directory
+        # scan the index was seeded from and adopt the entry on a hit
+        with os.scandir(self.upload_dir) as entries:
+            for disk_entry in entries:
+                if disk_entry.is_file() and disk_entry.name.split('.', 1)[0] == file_id:
+                    self._index[file_id] = (disk_entry.path, disk_entry.stat().st_ctime)
+                    return disk_entry.path
+        return None
 
     async def extract_text_from_file(self, file_id: str) -> Tuple[bool, str, str]:
         """Extract text content from uploaded file"""
@@ -100,17 +139,13 @@ class FileService:
             if not os.path.exists(file_path):
                 return False, "File does not exist", ""
 
-            file_extension = file_path.rsplit('.', 1)[-1].lower()
-            
-            if file_extension == 'pdf':
-                text = await self._extract_pdf_text(file_path)
-            elif file_extension == 'docx':
-                text = await self._extract_docx_text(file_path)
-            elif file_extension == 'txt':
-                text = await self._extract_txt_text(file_path)
-            else:
+            file_extension = os.path.splitext(file_path)[1][1:].lower()
+            extractor = self._extractors.get(file_extension)
+            if extractor is None:
                 return False, f"Unsupported file type: {file_extension}", ""
 
+            text = await extractor(file_path)
+
             if not text.strip():
                 return False, "No text content found in file", ""
 
@@ -122,43 +157,67 @@ class FileService:
 
     async def _extract_pdf_text(self, file_path: str) -> str:
         """Extract text from PDF file"""
+        # Extraction is CPU-bound C work - run it in the threadpool so the
+        # event loop keeps serving other requests
+        return await asyncio.to_thread(self._extract_pdf_text_sync, file_path)
+
+    def _extract_pdf_text_sync(self, file_path: str) -> str:
+        """Extract text from PDF file using the PDFium C library"""
         try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
+            pdf = pypdfium2.PdfDocument(file_path)
+            try:
+                parts = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    page_text = textpage.get_text_range()
                     if page_text:
-                        text += page_text + "\n"
-            return text.strip()
+                        parts.append(page_text)
+                        parts.append("\n")
+                    textpage.close()
+                    page.close()
+                return "".join(parts).strip()
+            finally:
+                pdf.close()
         except Exception as e:
             logger.error(f"Error extracting PDF text: {str(e)}")
             raise
 
     async def _extract_docx_text(self, file_path: str) -> str:
         """Extract text from DOCX file"""
+        # python-docx parsing is blocking CPU work - keep it off the event loop
+        return await asyncio.to_thread(self._extract_docx_text_sync, file_path)
+
+    def _extract_docx_text_sync(self, file_path: str) -> str:
+        """Extract text from DOCX file with python-docx"""
         try:
             doc = Document(file_path)
-            text = ""
+            # List accumulator + join keeps concatenation O(n) instead of the
+            # quadratic repeated += on large documents
+            parts = []
             for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+                parts.append(paragraph.text)
+                parts.append("\n")
+            return "".join(parts).strip()
         except Exception as e:
             logger.error(f"Error extracting DOCX text: {str(e)}")
             raise
 
     async def _extract_txt_text(self, file_path: str) -> str:
         """Extract text from TXT file"""
+        # One thread dispatch for the whole open+read+close instead of a hop
+        # per aiofiles syscall
+        return await asyncio.to_thread(self._extract_txt_text_sync, file_path)
+
+    def _extract_txt_text_sync(self, file_path: str) -> str:
+        """Read a text file, falling back to latin-1 for non-UTF-8 content"""
         try:
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as file:
-                text = await file.read()
-            return text.strip()
+            with open(file_path, 'r', encoding='utf-8') as file:
+                return file.read().strip()
         except UnicodeDecodeError:
             # Try with different encoding
             try:
-                async with aiofiles.open(file_path, 'r', encoding='latin-1') as file:
-                    text = await file.read()
-                return text.strip()
+                with open(file_path, 'r', encoding='latin-1') as file:
+                    return file.read().strip()
             except Exception as e:
                 logger.error(f"Error reading text file with latin-1 encoding: {str(e)}")
                 raise
@@ -172,8 +231,11 @@ class FileService:
             file_path = self.get_file_path(file_id)
             if file_path and os.path.exists(file_path):
                 os.remove(file_path)
+                self._index.pop(file_id, None)
                 logger.info(f"File cleaned up: {file_id}")
                 return True
+            # Drop any stale index entry pointing at an already-deleted file
+            self._index.pop(file_id, None)
             return False
         except Exception as e:
             logger.error(f"Error cleaning up file: {str(e)}")
@@ -182,22 +244,27 @@ class FileService:
     def cleanup_old_files(self, max_age_hours: int = 24) -> int:
         """Clean up files older than specified hours"""
         try:
-            import time
-            current_time = time.time()
+            # Compare raw ctimes against a precomputed cutoff - one subtraction
+            # outside the loop instead of a division per file
+            cutoff = time.time() - max_age_hours * 3600
             deleted_count = 0
-            
-            for filename in os.listdir(self.upload_dir):
-                file_path = os.path.join(self.upload_dir, filename)
-                file_age_hours = (current_time - os.path.getctime(file_path)) / 3600
-                
-                if file_age_hours > max_age_hours:
+
+            # Sweep the directory with scandir: DirEntry caches the stat
+            # result, so each entry costs one syscall, and the sweep also
+            # catches files written by other worker processes that this
+            # process's index never saw
+            with os.scandir(self.upload_dir) as entries:
+                for entry in entries:
                     try:
-                        os.remove(file_path)
+                        if not entry.is_file() or entry.stat().st_ctime > cutoff:
+                            continue
+                        os.unlink(entry.path)
+                        self._index.pop(entry.name.split('.', 1)[0], None)
                         deleted_count += 1
-                        logger.info(f"Cleaned up old file: {filename}")
+                        logger.info(f"Cleaned up old file: {entry.name}")
                     except Exception as e:
-                        logger.error(f"Error deleting old file {filename}: {str(e)}")
-            
+                        logger.error(f"Error deleting old file {entry.path}: {str(e)}")
+
             return deleted_count
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}")
@@ -1,45 +1,133 @@
-import json
+import asyncio
 import logging
 import re
+from functools import lru_cache
+from string import Template
 from typing import Dict, List, Optional, Any
 import google.generativeai as genai
+import orjson
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
-import requests
-from bs4 import BeautifulSoup
+import httpx
+from selectolax.parser import HTMLParser
 
 from app.core.config import settings
-from app.models.schemas import ResumeData, JobDescription, ProfileEnrichment
+from app.models.schemas import (
+    ResumeData,
+    JobDescription,
+    ProfileEnrichment,
+    ExperienceItem,
+    EducationItem,
+    ProjectItem
+)
+from app.services.llm_cache import llm_cache, cached_llm_call
 
 logger = logging.getLogger(__name__)
 
-class GeminiService:
-    def __init__(self):
-        """Initialize Gemini service with API key and model configuration"""
-        if not settings.validate_gemini_api_key():
-            raise ValueError("GEMINI_API_KEY is required and must not be empty")
-        
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
-        
-        # Safety settings
-        self.safety_settings = {
-            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-        }
 
-    async def parse_job_description_text(self, job_description_text: str) -> JobDescription:
-        """Parse job description from raw text using Gemini analysis"""
-        try:
-            # Use Gemini to extract structured job description from text
-            prompt = f"""
+class InvalidGeminiKeyError(Exception):
+    """Raised when Gemini rejects the configured API key"""
+    pass
+
+
+# Gemini's rejection messages for a bad/misconfigured API key
+_BAD_KEY_RE = re.compile(r"API_KEY_INVALID|API key not valid")
+
+# Collapse runs of whitespace in scraped page text in one C-level pass
+_WS_RE = re.compile(r"\s+")
+
+# Transient Gemini failures worth retrying (rate limits, server-side errors)
+_RETRYABLE_ERROR_RE = re.compile(
+    r"429|rate limit|resource.{0,2}exhausted|quota|deadline|unavailable|internal",
+    re.IGNORECASE
+)
+
+# Prompt size guard: a chars/4 heuristic screens every call for free; the
+# exact count_tokens API round-trip is only paid when the heuristic says the
+# prompt is close to the model's input window
+_MODEL_INPUT_TOKEN_LIMIT = 1_000_000
+_EST_CHARS_PER_TOKEN = 4
+
+# Cache namespace: model id plus prompt version. Bump the version whenever
+# a prompt template changes so stale cached parses never leak across deploys
+_CACHE_NAMESPACE = f"{settings.GEMINI_MODEL}|prompt-v1"
+
+# Generation configs are immutable per call site, so build them once at import
+# instead of allocating a fresh GenerationConfig per request. Native JSON mode
+# guarantees parseable output instead of relying on prompt engineering alone
+_PARSE_CFG = genai.GenerationConfig(
+    temperature=0.1,
+    max_output_tokens=3000,
+    response_mime_type="application/json",
+)
+_ANALYSIS_CFG = genai.GenerationConfig(
+    temperature=0.2,
+    max_output_tokens=5000,
+    response_mime_type="application/json",
+)
+
+# Likewise for the safety thresholds: one shared mapping for every call
+_SAFETY_SETTINGS = {
+    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+}
+
+
+def _strip_code_fence(text: str) -> str:
+    """Strip an optional markdown code fence from a Gemini response.
+
+    removeprefix/removesuffix are single C calls that return the original
+    object untouched on the common fence-free path.
+    """
+    return (
+        text.strip()
+        .removeprefix('```json')
+        .removeprefix('```')
+        .removesuffix('```')
+        .strip()
+    )
+
+
+def _dedup_ci(items: List[str]) -> List[str]:
+    """Order-preserving, case-insensitive dedup for skill lists.
+
+    Gemini often lists the same skill under both required_skills and
+    technical_requirements; one O(n) pass here keeps downstream matching
+    and the analysis prompt from carrying duplicates.
+    """
+    seen = {}
+    for item in items:
+        if item:
+            seen.setdefault(item.lower(), item)
+    return list(seen.values())
+
+
+def _html_to_text(html: bytes) -> str:
+    """Turn raw job-page HTML into capped, whitespace-normalized text.
+
+    Parse with lexbor (C) instead of the pure-Python html.parser, drop
+    non-content subtrees, pre-cap the raw text so whitespace collapse
+    touches at most ~48 KB, then apply the final token-budget limit.
+    Runs in the threadpool - on large pages the parse can take hundreds
+    of milliseconds and must not stall the event loop.
+    """
+    tree = HTMLParser(html)
+    tree.strip_tags(['script', 'style', 'noscript', 'template'])
+    body = tree.body or tree.root
+    page_text = body.text(separator=' ') if body is not None else ''
+    return _WS_RE.sub(' ', page_text[:48000]).strip()[:12000]
+
+
+# Prompt templates are built once at import time; per-request calls only
+# substitute the dynamic fields instead of rebuilding multi-KB f-strings
+_JD_TEXT_PROMPT = Template("""
             You are an expert HR analyst. Extract comprehensive job description information from the following job description text and return it in JSON format.
             
             CRITICAL: Be thorough and extract ALL relevant details including technical requirements, soft skills, experience requirements, and qualifications.
             
             Required JSON structure:
-            {{
+            {
                 "title": "Exact job title from posting",
                 "company": "Company name (if mentioned, otherwise 'Not specified')",
                 "description": "Complete job description including responsibilities, duties, and role overview",
@@ -54,7 +142,7 @@ class GeminiService:
                 "key_responsibilities": ["responsibility1", "responsibility2", ...],
                 "technical_requirements": ["technical_req1", "technical_req2", ...],
                 "soft_skills": ["communication", "teamwork", "leadership", ...]
-            }}
+            }
             
             EXTRACTION GUIDELINES:
             1. Extract ALL technical skills, frameworks, programming languages, tools mentioned
@@ -67,89 +155,16 @@ class GeminiService:
             8. Infer job title if not explicitly stated based on responsibilities and requirements
             
             Job Description Text:
-            {job_description_text}
-            """
-            
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.GenerationConfig(
-                    temperature=0.1,
-                    max_output_tokens=3000,
-                ),
-                safety_settings=self.safety_settings
-            )
-            
-            # Parse JSON response with better error handling
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-            
-            job_data = json.loads(response_text)
-            
-            # Validate required fields and provide meaningful defaults
-            if not job_data.get("title") or job_data.get("title") == "Not specified":
-                job_data["title"] = "Position Analysis"
-            if not job_data.get("description"):
-                raise Exception("Could not extract meaningful job description from the provided text")
-            
-            return JobDescription(
-                title=job_data.get("title", "Position Analysis"),
-                company=job_data.get("company", "Not specified"),
-                description=job_data.get("description", ""),
-                required_skills=job_data.get("required_skills", []) + job_data.get("technical_requirements", []),
-                preferred_skills=job_data.get("preferred_skills", []) + job_data.get("soft_skills", []),
-                experience_level=job_data.get("experience_level", "Not specified"),
-                education_requirements=job_data.get("education_requirements", []),
-                location=job_data.get("location", "Not specified")
-            )
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing Gemini response: {str(e)}")
-            logger.error(f"Raw response: {response.text[:500]}...")
-            raise Exception("Failed to parse job description. Please provide a more detailed and structured job description.")
-        except Exception as e:
-            logger.error(f"Error parsing job description: {str(e)}")
-            raise Exception(f"Failed to analyze job description: {str(e)}")
+            ${job_description_text}
+            """)
 
-    async def extract_job_description_from_url(self, job_url: str) -> JobDescription:
-        """Extract job description from URL using web scraping and Gemini analysis"""
-        try:
-            # Scrape the job description page
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(job_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text content
-            page_text = soup.get_text()
-            
-            # Clean up whitespace
-            lines = (line.strip() for line in page_text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            page_text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            # Limit text length to avoid token limits but increase to capture more details
-            page_text = page_text[:12000]
-            
-            # Use Gemini to extract structured job description with enhanced prompting
-            prompt = f"""
+_JD_URL_PROMPT = Template("""
             You are an expert HR analyst. Extract comprehensive job description information from the following webpage content and return it in JSON format.
             
             CRITICAL: Be thorough and extract ALL relevant details including technical requirements, soft skills, experience requirements, and qualifications.
             
             Required JSON structure:
-            {{
+            {
                 "title": "Exact job title from posting",
                 "company": "Company name",
                 "description": "Complete job description including responsibilities, duties, and role overview",
@@ -164,7 +179,7 @@ class GeminiService:
                 "key_responsibilities": ["responsibility1", "responsibility2", ...],
                 "technical_requirements": ["technical_req1", "technical_req2", ...],
                 "soft_skills": ["communication", "teamwork", "leadership", ...]
-            }}
+            }
             
             EXTRACTION GUIDELINES:
             1. Extract ALL technical skills, frameworks, programming languages, tools mentioned
@@ -176,107 +191,57 @@ class GeminiService:
             7. If information is missing, use empty strings or empty arrays - DO NOT make assumptions
             
             Webpage content:
-            {page_text}
-            """
-            
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.GenerationConfig(
-                    temperature=0.1,
-                    max_output_tokens=3000,
-                ),
-                safety_settings=self.safety_settings
-            )
-            
-            # Parse JSON response with better error handling
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-            
-            job_data = json.loads(response_text)
-            
-            # Validate required fields and provide meaningful defaults
-            if not job_data.get("title"):
-                raise Exception("Could not extract job title from the webpage")
-            if not job_data.get("description"):
-                raise Exception("Could not extract job description from the webpage")
-            
-            return JobDescription(
-                title=job_data.get("title", ""),
-                company=job_data.get("company", ""),
-                description=job_data.get("description", ""),
-                required_skills=job_data.get("required_skills", []) + job_data.get("technical_requirements", []),
-                preferred_skills=job_data.get("preferred_skills", []) + job_data.get("soft_skills", []),
-                experience_level=job_data.get("experience_level", ""),
-                education_requirements=job_data.get("education_requirements", []),
-                location=job_data.get("location", "")
-            )
-            
-        except requests.RequestException as e:
-            logger.error(f"Error fetching job URL: {str(e)}")
-            raise Exception(f"Failed to fetch job description from URL: {str(e)}. Please check if the URL is accessible.")
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing Gemini response: {str(e)}")
-            logger.error(f"Raw response: {response.text[:500]}...")
-            raise Exception("Failed to parse job description from webpage. The webpage might not contain a standard job posting.")
-        except Exception as e:
-            logger.error(f"Error extracting job description: {str(e)}")
-            raise Exception(f"Failed to extract job description: {str(e)}")
+            ${page_text}
+            """)
 
-    async def parse_resume_with_urls(self, resume_text: str) -> Dict[str, Any]:
-        """Parse resume and extract both structured data and social media URLs"""
-        try:
-            prompt = f"""
+_RESUME_PARSE_PROMPT = Template("""
             Analyze the following resume text and extract information in JSON format:
             
             Required JSON structure:
-            {{
-                "personal_info": {{
+            {
+                "personal_info": {
                     "name": "Full name",
                     "email": "email address",
                     "phone": "phone number",
                     "location": "location/address"
-                }},
-                "social_urls": {{
+                },
+                "social_urls": {
                     "linkedin_url": "LinkedIn profile URL if found",
                     "github_url": "GitHub profile URL if found",
                     "portfolio_url": "Portfolio/website URL if found",
                     "other_urls": ["other professional URLs"]
-                }},
+                },
                 "professional_summary": "Brief professional summary",
                 "skills": ["skill1", "skill2", "skill3", ...],
                 "experience": [
-                    {{
+                    {
                         "title": "Job title",
                         "company": "Company name",
                         "duration": "Time period",
                         "description": "Job description"
-                    }}
+                    }
                 ],
                 "education": [
-                    {{
+                    {
                         "degree": "Degree name",
                         "institution": "School/University",
                         "year": "Graduation year",
                         "gpa": "GPA if mentioned"
-                    }}
+                    }
                 ],
                 "certifications": ["cert1", "cert2", ...],
                 "projects": [
-                    {{
+                    {
                         "name": "Project name",
                         "description": "Project description",
                         "technologies": ["tech1", "tech2", ...]
-                    }}
+                    }
                 ],
                 "languages": ["language1", "language2", ...]
-            }}
+            }
             
             Resume text:
-            {resume_text}
+            ${resume_text}
             
             Extract all available information. For social URLs, look for:
             - LinkedIn: linkedin.com/in/...
@@ -285,167 +250,79 @@ class GeminiService:
             - Any other professional URLs
             
             If information is not found, use empty strings or empty arrays.
-            """
-            
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.GenerationConfig(
-                    temperature=0.1,
-                    max_output_tokens=3000,
-                ),
-                safety_settings=self.safety_settings
-            )
-            
-            logger.info(f"Gemini response received, length: {len(response.text)} chars")
-            logger.debug(f"Gemini response preview: {response.text[:200]}...")
-            
-            # Parse JSON response
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-            
-            parsed_data = json.loads(response_text)
-            
-            # Convert to ResumeData format
-            resume_data = ResumeData(
-                name=parsed_data.get("personal_info", {}).get("name", ""),
-                email=parsed_data.get("personal_info", {}).get("email", ""),
-                phone=parsed_data.get("personal_info", {}).get("phone", ""),
-                location=parsed_data.get("personal_info", {}).get("location", ""),
-                summary=parsed_data.get("professional_summary", ""),
-                skills=parsed_data.get("skills", []),
-                experience=parsed_data.get("experience", []),
-                education=parsed_data.get("education", []),
-                certifications=parsed_data.get("certifications", []),
-                projects=parsed_data.get("projects", []),
-                languages=parsed_data.get("languages", [])
-            )
-            
-            return {
-                "resume_data": resume_data,
-                "social_urls": parsed_data.get("social_urls", {})
-            }
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing Gemini response as JSON: {str(e)}")
-            logger.error(f"Gemini response text: {response.text[:500]}...")
-            raise Exception(f"Failed to parse resume data - Invalid JSON response: {str(e)}")
-        except Exception as e:
-            logger.error(f"Error parsing resume: {str(e)}")
-            if hasattr(e, 'message'):
-                logger.error(f"Detailed error: {e.message}")
-            raise Exception(f"Failed to parse resume: {str(e)}")
+            """)
 
-    async def comprehensive_candidate_analysis(
-        self, 
-        resume_data: ResumeData, 
-        job_description: JobDescription,
-        profile_enrichment: Optional[ProfileEnrichment] = None
-    ) -> Dict[str, Any]:
-        """Perform comprehensive candidate analysis using Gemini - FOCUSED ON JOB DESCRIPTION MATCHING"""
-        try:
-            # Convert Pydantic models to dicts for JSON serialization
-            experience_dicts = [exp.dict() for exp in resume_data.experience]
-            education_dicts = [edu.dict() for edu in resume_data.education]
-            project_dicts = [proj.dict() for proj in resume_data.projects]
-            
-            prompt = f"""
+_ANALYSIS_PROMPT = Template("""
             You are an expert HR analyst and recruiter. Perform a comprehensive analysis of this candidate SPECIFICALLY for the given job position.
             
             **CRITICAL INSTRUCTION: ALL analysis, scoring, strengths, weaknesses, and recommendations MUST be in direct reference to the specific job requirements listed below. Do not provide generic feedback.**
             
             ===== JOB DESCRIPTION (REFERENCE FOR ALL ANALYSIS) =====
-            Position: {job_description.title} at {job_description.company}
+            Position: ${job_title} at ${job_company}
             
             Job Description:
-            {job_description.description}
+            ${job_description}
             
-            REQUIRED SKILLS: {', '.join(job_description.required_skills)}
-            PREFERRED SKILLS: {', '.join(job_description.preferred_skills)}
-            EXPERIENCE LEVEL: {job_description.experience_level}
-            EDUCATION REQUIREMENTS: {', '.join(job_description.education_requirements)}
-            LOCATION: {job_description.location}
+            REQUIRED SKILLS: ${required_skills}
+            PREFERRED SKILLS: ${preferred_skills}
+            EXPERIENCE LEVEL: ${experience_level}
+            EDUCATION REQUIREMENTS: ${education_requirements}
+            LOCATION: ${job_location}
             
             ===== CANDIDATE RESUME =====
-            Name: {resume_data.name}
-            Email: {resume_data.email}
-            Professional Summary: {resume_data.summary}
-            
-            Skills: {', '.join(resume_data.skills)}
-            
-            Work Experience:
-            {json.dumps(experience_dicts, indent=2)}
+            Name: ${candidate_name}
+            Email: ${candidate_email}
+            Professional Summary: ${candidate_summary}
             
-            Education:
-            {json.dumps(education_dicts, indent=2)}
+            Skills: ${candidate_skills}
             
-            Projects:
-            {json.dumps(project_dicts, indent=2)}
-            
-            Certifications: {', '.join(resume_data.certifications)}
+            Work Experience, Education and Projects (JSON):
+            ${resume_sections_json}
+
+            Certifications: ${certifications}
             
             ===== ANALYSIS REQUIREMENTS =====
-            Analyze this candidate EXCLUSIVELY for the "{job_description.title}" position. Every comment, score, and recommendation must be job-specific.
+            Analyze this candidate EXCLUSIVELY for the "${job_title}" position. Every comment, score, and recommendation must be job-specific.
             
             Return analysis in this EXACT JSON format:
-            {{
+            {
                 "overall_score": 75.5,
-                "score_breakdown": {{
+                "score_breakdown": {
                     "required_skills_match": 80.0,
                     "experience_relevance": 75.0,
                     "education_fit": 85.0,
                     "job_specific_alignment": 70.0
-                }},
-                "skills_analysis": {{
+                },
+                "skills_analysis": {
                     "matching_required_skills": ["skill1", "skill2"],
                     "missing_required_skills": ["missing_skill1", "missing_skill2"],
                     "matching_preferred_skills": ["pref_skill1"],
                     "missing_preferred_skills": ["missing_pref1", "missing_pref2"]
-                }},
-                "strengths_for_this_role": [
-                    "Strong experience in [specific technology] which is critical for this {job_description.title} role",
-                    "Previous work at [company] demonstrates exact skills needed for {job_description.company}",
-                    "Education in [field] aligns perfectly with job requirements"
-                ],
-                "weaknesses_for_this_role": [
-                    "Limited experience with [specific tool] mentioned in job requirements",
-                    "No demonstrated experience in [specific area] required for this position"
-                ],
-                "experience_match_analysis": {{
+                },
+                "strengths_for_this_role": ["job-specific strength referencing a concrete requirement", ...],
+                "weaknesses_for_this_role": ["job-specific gap referencing a concrete requirement", ...],
+                "experience_match_analysis": {
                     "relevant_experience_years": "X years relevant to this role",
                     "matching_responsibilities": ["responsibility1", "responsibility2"],
-                    "experience_level_fit": "Under-qualified/Qualified/Over-qualified for {job_description.experience_level} level",
+                    "experience_level_fit": "Under-qualified/Qualified/Over-qualified for ${experience_level} level",
                     "industry_relevance": "Analysis of industry experience match"
-                }},
-                "education_analysis": {{
+                },
+                "education_analysis": {
                     "meets_requirements": true/false,
                     "relevant_degrees": ["degree that matches job requirements"],
                     "additional_certifications_needed": ["cert1", "cert2"]
-                }},
-                "hiring_recommendation": {{
+                },
+                "hiring_recommendation": {
                     "decision": "STRONG HIRE/HIRE/CONSIDER/REJECT",
                     "confidence_level": "High/Medium/Low",
                     "reasoning": "Specific reasoning based on job requirements match"
-                }},
-                "interview_focus_areas": [
-                    "Ask about experience with [specific technology from job requirements]",
-                    "Probe deeper into [specific project] to assess [job-relevant skill]",
-                    "Verify hands-on experience with [critical job requirement]"
-                ],
-                "red_flags_for_this_role": [
-                    "Lacks critical requirement: [specific requirement]",
-                    "Experience gap in [specific area needed for role]"
-                ],
-                "onboarding_recommendations": [
-                    "Provide training in [missing skill] before role start",
-                    "Pair with senior [role type] for mentoring in [specific area]"
-                ],
+                },
+                "interview_focus_areas": ["question probing a specific job requirement", ...],
+                "red_flags_for_this_role": ["missing critical requirement or experience gap", ...],
+                "onboarding_recommendations": ["training or mentoring for a specific gap", ...],
                 "salary_fit_assessment": "Analysis of candidate level vs role requirements",
-                "detailed_job_fit_analysis": "Comprehensive 2-3 paragraph analysis explaining specifically how this candidate fits (or doesn't fit) the {job_description.title} role at {job_description.company}. Reference specific job requirements, candidate experience, and provide actionable hiring recommendation."
-            }}
+                "detailed_job_fit_analysis": "Comprehensive 2-3 paragraph job-specific fit analysis with an actionable hiring recommendation"
+            }
             
             SCORING GUIDELINES (TOTAL 100 POINTS):
             - Required Skills Match (0-30): How many required skills does candidate have vs needs
@@ -460,29 +337,322 @@ class GeminiService:
             4. Provide job-specific interview questions
             5. Give actionable hiring recommendation for THIS role
             6. Do not provide generic HR feedback - everything must be job-specific
-            """
-            
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.GenerationConfig(
-                    temperature=0.2,
-                    max_output_tokens=5000,
-                ),
-                safety_settings=self.safety_settings
+            """)
+
+
+class GeminiService:
+    def __init__(self):
+        """Initialize Gemini service with API key and model configuration"""
+        if not settings.validate_gemini_api_key():
+            raise ValueError("GEMINI_API_KEY is required and must not be empty")
+        
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        self.model = genai.GenerativeModel('gemini-2.0-flash')
+        
+        # Persistent HTTP client for job-page scraping - pooled keep-alive
+        # connections avoid a fresh TCP/TLS handshake per request
+        self.http_client = httpx.AsyncClient(
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            },
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                # Hold idle connections for a minute so bursts of scrapes to
+                # the same job board skip the ~100-300 ms TCP/TLS handshake
+                keepalive_expiry=60.0,
+            ),
+            timeout=30.0,
+            follow_redirects=True
+        )
+
+        # Bound concurrent Gemini calls per worker so bursts queue gracefully
+        # instead of slamming into per-minute rate limits
+        self._semaphore = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+
+        # Safety settings (shared module-level mapping)
+        self.safety_settings = _SAFETY_SETTINGS
+
+    async def aclose(self):
+        """Release pooled HTTP connections on application shutdown"""
+        await self.http_client.aclose()
+
+    async def _generate(self, prompt: str, generation_config: "genai.GenerationConfig"):
+        """Run a Gemini call under the concurrency semaphore, retrying
+        transient rate-limit/server errors with exponential backoff"""
+        # Heuristic-first size check: skip the count_tokens round-trip for
+        # the common small prompt, but never ship an oversized one that the
+        # server would truncate or reject
+        if len(prompt) // _EST_CHARS_PER_TOKEN >= 0.8 * _MODEL_INPUT_TOKEN_LIMIT:
+            counted = await self.model.count_tokens_async(prompt)
+            if counted.total_tokens > _MODEL_INPUT_TOKEN_LIMIT:
+                keep = int(len(prompt) * _MODEL_INPUT_TOKEN_LIMIT / counted.total_tokens * 0.95)
+                logger.warning(
+                    f"Prompt of {counted.total_tokens} tokens exceeds the model input limit; truncating to ~{keep} chars"
+                )
+                prompt = prompt[:keep]
+
+        delay = 1.0
+        async with self._semaphore:
+            for attempt in range(4):
+                try:
+                    # Native async call: the event loop keeps serving other
+                    # requests for the full multi-second LLM round-trip
+                    return await self.model.generate_content_async(
+                        prompt,
+                        generation_config=generation_config,
+                        safety_settings=self.safety_settings
+                    )
+                except Exception as e:
+                    if _BAD_KEY_RE.search(str(e)):
+                        raise InvalidGeminiKeyError(str(e)) from e
+                    if attempt == 3 or not _RETRYABLE_ERROR_RE.search(str(e)):
+                        raise
+                    logger.warning(
+                        f"Transient Gemini error (attempt {attempt + 1}), retrying in {delay:.0f}s: {str(e)}"
+                    )
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 30.0)
+
+
+    async def _generate_json(
+        self,
+        prompt: str,
+        generation_config: "genai.GenerationConfig",
+        max_retries: int = 2
+    ) -> Dict[str, Any]:
+        """Generate a response and parse it as JSON, feeding parse errors
+        back to the model for a bounded number of corrective retries.
+
+        A malformed response costs one extra LLM call here instead of a
+        user-visible failure plus a full manual re-submission.
+        """
+        for attempt in range(max_retries + 1):
+            response = await self._generate(prompt, generation_config)
+            response_text = _strip_code_fence(response.text)
+            try:
+                return orjson.loads(response_text)
+            except orjson.JSONDecodeError as e:
+                if attempt == max_retries:
+                    logger.error(f"Raw response: {response.text[:500]}...")
+                    raise
+                logger.warning(
+                    f"Gemini returned invalid JSON (attempt {attempt + 1}), retrying with feedback: {str(e)}"
+                )
+                prompt = (
+                    f"{prompt}\n\nYour previous output had error: {str(e)}. "
+                    "Return only valid JSON matching the required structure."
+                )
+                await asyncio.sleep(1.0 * (attempt + 1))
+
+    @cached_llm_call(llm_cache, namespace=_CACHE_NAMESPACE)
+    async def parse_job_description_text(self, job_description_text: str) -> JobDescription:
+        """Parse job description from raw text using Gemini analysis"""
+        try:
+            # Use Gemini to extract structured job description from text
+            prompt = _JD_TEXT_PROMPT.substitute(job_description_text=job_description_text)
+            
+            job_data = await self._generate_json(prompt, _PARSE_CFG)
+            
+            # Validate required fields and provide meaningful defaults
+            if not job_data.get("title") or job_data.get("title") == "Not specified":
+                job_data["title"] = "Position Analysis"
+            if not job_data.get("description"):
+                raise Exception("Could not extract meaningful job description from the provided text")
+            
+            return JobDescription(
+                title=job_data.get("title", "Position Analysis"),
+                company=job_data.get("company", "Not specified"),
+                description=job_data.get("description", ""),
+                required_skills=_dedup_ci(job_data.get("required_skills", []) + job_data.get("technical_requirements", [])),
+                preferred_skills=_dedup_ci(job_data.get("preferred_skills", []) + job_data.get("soft_skills", [])),
+                experience_level=job_data.get("experience_level", "Not specified"),
+                education_requirements=job_data.get("education_requirements", []),
+                location=job_data.get("location", "Not specified")
+            )
+            
+        except InvalidGeminiKeyError:
+            raise
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Error parsing Gemini response: {str(e)}")
+            raise Exception("Failed to parse job description. Please provide a more detailed and structured job description.")
+        except Exception as e:
+            logger.error(f"Error parsing job description: {str(e)}")
+            raise Exception(f"Failed to analyze job description: {str(e)}")
+
+    @cached_llm_call(llm_cache, namespace=_CACHE_NAMESPACE)
+    async def extract_job_description_from_url(self, job_url: str) -> JobDescription:
+        """Extract job description from URL using web scraping and Gemini analysis"""
+        try:
+            # Scrape the job description page through the persistent async
+            # client - no event-loop stall, and pooled connections are reused.
+            # Stream and stop at 512 KB: bounds memory on multi-MB pages and
+            # skips bytes the downstream 12000-char cap would discard anyway
+            html = bytearray()
+            async with self.http_client.stream('GET', job_url) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(65536):
+                    html.extend(chunk)
+                    if len(html) >= 524288:
+                        break
+
+            # Parse and clean off the event loop so a big page never freezes
+            # other in-flight requests
+            page_text = await asyncio.to_thread(_html_to_text, bytes(html))
+            
+            # Use Gemini to extract structured job description with enhanced prompting
+            prompt = _JD_URL_PROMPT.substitute(page_text=page_text)
+            
+            job_data = await self._generate_json(prompt, _PARSE_CFG)
+            
+            # Validate required fields and provide meaningful defaults
+            if not job_data.get("title"):
+                raise Exception("Could not extract job title from the webpage")
+            if not job_data.get("description"):
+                raise Exception("Could not extract job description from the webpage")
+            
+            return JobDescription(
+                title=job_data.get("title", ""),
+                company=job_data.get("company", ""),
+                description=job_data.get("description", ""),
+                required_skills=_dedup_ci(job_data.get("required_skills", []) + job_data.get("technical_requirements", [])),
+                preferred_skills=_dedup_ci(job_data.get("preferred_skills", []) + job_data.get("soft_skills", [])),
+                experience_level=job_data.get("experience_level", ""),
+                education_requirements=job_data.get("education_requirements", []),
+                location=job_data.get("location", "")
+            )
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching job URL: {str(e)}")
+            raise Exception(f"Failed to fetch job description from URL: {str(e)}. Please check if the URL is accessible.")
+        except InvalidGeminiKeyError:
+            raise
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Error parsing Gemini response: {str(e)}")
+            raise Exception("Failed to parse job description from webpage. The webpage might not contain a standard job posting.")
+        except Exception as e:
+            logger.error(f"Error extracting job description: {str(e)}")
+            raise Exception(f"Failed to extract job description: {str(e)}")
+
+    @cached_llm_call(llm_cache, namespace=_CACHE_NAMESPACE)
+    async def parse_resume_with_urls(self, resume_text: str) -> Dict[str, Any]:
+        """Parse resume and extract both structured data and social media URLs"""
+        try:
+            prompt = _RESUME_PARSE_PROMPT.substitute(resume_text=resume_text)
+            
+            parsed_data = await self._generate_json(prompt, _PARSE_CFG)
+            
+            # Convert to ResumeData format. This is a trusted internal path -
+            # the JSON shape is dictated by our own prompt - so model_construct
+            # skips re-validating every field and nested item
+            personal_info = parsed_data.get("personal_info", {})
+            resume_data = ResumeData.model_construct(
+                name=personal_info.get("name", ""),
+                email=personal_info.get("email", ""),
+                phone=personal_info.get("phone", ""),
+                location=personal_info.get("location", ""),
+                summary=parsed_data.get("professional_summary", ""),
+                skills=parsed_data.get("skills", []),
+                experience=[
+                    ExperienceItem.model_construct(**item)
+                    for item in parsed_data.get("experience", [])
+                ],
+                education=[
+                    EducationItem.model_construct(**item)
+                    for item in parsed_data.get("education", [])
+                ],
+                certifications=parsed_data.get("certifications", []),
+                projects=[
+                    ProjectItem.model_construct(**item)
+                    for item in parsed_data.get("projects", [])
+                ],
+                languages=parsed_data.get("languages", [])
             )
             
-            logger.info(f"Analysis response received, length: {len(response.text)} chars")
-            logger.debug(f"Analysis response preview: {response.text[:200]}...")
+            return {
+                "resume_data": resume_data,
+                "social_urls": parsed_data.get("social_urls", {})
+            }
             
-            # Parse JSON response with better error handling
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
+        except InvalidGeminiKeyError:
+            raise
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Error parsing Gemini response as JSON: {str(e)}")
+            raise Exception(f"Failed to parse resume data - Invalid JSON response: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error parsing resume: {str(e)}")
+            if hasattr(e, 'message'):
+                logger.error(f"Detailed error: {e.message}")
+            raise Exception(f"Failed to parse resume: {str(e)}")
+
+    async def parse_resume_and_fetch_job(
+        self,
+        resume_text: str,
+        job_url: str
+    ) -> tuple:
+        """Run resume parsing and job-URL extraction concurrently.
+
+        The two calls are independent, so firing them together cuts
+        wall-clock to max(t1, t2) instead of t1 + t2. Returns
+        (parse_result, job_description).
+        """
+        parse_result, job_description = await asyncio.gather(
+            self.parse_resume_with_urls(resume_text),
+            self.extract_job_description_from_url(job_url)
+        )
+        return parse_result, job_description
+
+    async def parse_resume_and_job_text(
+        self,
+        resume_text: str,
+        job_description_text: str
+    ) -> tuple:
+        """Run resume parsing and raw-text JD parsing concurrently.
+
+        Text-JD counterpart of parse_resume_and_fetch_job: the two LLM
+        calls are independent, so the end-to-end flow pays
+        max(t1, t2) + analysis instead of t1 + t2 + analysis. Returns
+        (parse_result, job_description).
+        """
+        parse_result, job_description = await asyncio.gather(
+            self.parse_resume_with_urls(resume_text),
+            self.parse_job_description_text(job_description_text)
+        )
+        return parse_result, job_description
+
+    @cached_llm_call(llm_cache, namespace=_CACHE_NAMESPACE)
+    async def comprehensive_candidate_analysis(
+        self, 
+        resume_data: ResumeData, 
+        job_description: JobDescription,
+        profile_enrichment: Optional[ProfileEnrichment] = None
+    ) -> Dict[str, Any]:
+        """Perform comprehensive candidate analysis using Gemini - FOCUSED ON JOB DESCRIPTION MATCHING"""
+        try:
+            # Serialize the resume sub-sections in one compiled pass instead
+            # of per-item .dict() calls followed by separate json.dumps walks,
+            # then render them as a single JSON document for the prompt
+            resume_sections = resume_data.model_dump(include={'experience', 'education', 'projects'})
+            resume_sections_json = orjson.dumps(resume_sections, option=orjson.OPT_INDENT_2).decode()
+            
+            prompt = _ANALYSIS_PROMPT.substitute(
+                job_title=job_description.title,
+                job_company=job_description.company,
+                job_description=job_description.description,
+                required_skills=', '.join(job_description.required_skills),
+                preferred_skills=', '.join(job_description.preferred_skills),
+                experience_level=job_description.experience_level,
+                education_requirements=', '.join(job_description.education_requirements),
+                job_location=job_description.location,
+                candidate_name=resume_data.name,
+                candidate_email=resume_data.email,
+                candidate_summary=resume_data.summary,
+                candidate_skills=', '.join(resume_data.skills),
+                resume_sections_json=resume_sections_json,
+                certifications=', '.join(resume_data.certifications)
+            )
             
-            analysis = json.loads(response_text)
+            analysis = await self._generate_json(prompt, _ANALYSIS_CFG)
             
             # Validate that we got a proper job-focused analysis
             if not analysis.get("skills_analysis") or not analysis.get("detailed_job_fit_analysis"):
@@ -490,14 +660,23 @@ class GeminiService:
             
             return analysis
             
-        except json.JSONDecodeError as e:
+        except InvalidGeminiKeyError:
+            raise
+        except orjson.JSONDecodeError as e:
             logger.error(f"Error parsing Gemini analysis response: {str(e)}")
-            logger.error(f"Analysis response text: {response.text[:500]}...")
             raise Exception(f"Failed to parse analysis results - Invalid JSON: {str(e)}")
         except Exception as e:
             logger.error(f"Error in comprehensive analysis: {str(e)}")
             raise Exception(f"Analysis failed: {str(e)}")
 
 
-# Global service instance
-gemini_service = GeminiService() 
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_gemini_service() -> GeminiService:
+    """Lazy shared service instance.
+
+    Construction (API-key validation, genai.configure, HTTP client) is
+    deferred to first use, so workers that never touch LLM endpoints skip
+    it and a misconfigured key surfaces as an endpoint error instead of
+    an import-time crash.
+    """
+    return GeminiService()
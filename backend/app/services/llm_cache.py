@@ -0,0 +1,104 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """Async-safe TTL + LRU cache for expensive Gemini calls.
+
+    Identical resume/job-description text submitted repeatedly (demo reruns,
+    client retries, CI) becomes a dictionary lookup instead of a multi-second
+    Gemini round-trip. Entries are keyed by a SHA-256 fingerprint of the
+    normalized inputs and expire after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: int = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the given string parts"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode('utf-8', errors='replace'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing/expired"""
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full"""
+        async with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+def _fingerprint(value: Any) -> str:
+    """Normalize an argument into a stable string for cache keying.
+
+    String inputs are whitespace-collapsed so re-pastes of the same resume
+    or job description that differ only in spacing, tabs or blank lines
+    still land on the same cache entry.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump_json()
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    return repr(value)
+
+
+def cached_llm_call(cache: LLMCache, namespace: str = ""):
+    """Decorate an async service method so identical inputs hit the cache.
+
+    The key covers the method name plus every positional/keyword argument
+    (excluding `self`), so distinct prompts never collide. `namespace`
+    lets callers fold model id and prompt version into the key, so cached
+    entries are naturally invalidated when either changes.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            key = cache.make_key(
+                namespace,
+                func.__qualname__,
+                *[_fingerprint(arg) for arg in args],
+                *[f"{name}={_fingerprint(value)}" for name, value in sorted(kwargs.items())]
+            )
+            cached_value = await cache.get(key)
+            if cached_value is not None:
+                logger.info(f"LLM cache hit for {func.__qualname__}")
+                return cached_value
+
+            result = await func(self, *args, **kwargs)
+            await cache.set(key, result)
+            return result
+        return wrapper
+    return decorator
+
+
+# Global cache instance shared by all Gemini-backed methods
+llm_cache = LLMCache()
@@ -91,9 +91,6 @@ export interface ProfileEnrichment {
 
 export interface ScoreBreakdown {
   resume_match: number;
-  linkedin_score: number;
-  github_score: number;
-  portfolio_score: number;
   total_score: number;
   explanation: string;
 }
@@ -61,9 +61,13 @@ def main():
     print("🚀 Starting Uvicorn server...")
     try:
         subprocess.run([
-            uvicorn_path, 'app.main:app', 
-            '--host', '127.0.0.1', 
+            uvicorn_path, 'app.main:app',
+            '--host', '127.0.0.1',
             '--port', '8000',
+            # uvloop + httptools (bundled with uvicorn[standard]) speed up
+            # the asyncio HTTP fan-out in scraping/enrichment
+            '--loop', 'uvloop',
+            '--http', 'httptools',
             '--reload'
         ])
     except KeyboardInterrupt: